@@ -2,10 +2,42 @@
 from __future__ import annotations
 
 import json
+import mmap
+import operator
 import os
-from dataclasses import dataclass
+import re
+import sys
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields
 from datetime import datetime, timedelta
-from typing import Any, ClassVar, Dict, List, Optional, Type
+from itertools import compress, count, islice, repeat
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None  # type: ignore
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional streaming parser
+    ijson = None  # type: ignore
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional binary storage format
+    msgpack = None  # type: ignore
 
 try:
     import tkinter as tk
@@ -18,6 +50,36 @@ except ModuleNotFoundError:  # pragma: no cover - tkinter unavailable in some en
 
 DATE_FORMAT = "%Y-%m-%d"
 VALID_ITEM_TYPES = {"Book", "DVD"}
+STREAMING_THRESHOLD_BYTES = 10 * 1024 * 1024
+MSGPACK_SUFFIX = ".msgpack"
+_DECODE_ERRORS: Tuple[Type[Exception], ...] = (json.JSONDecodeError,)
+if ijson is not None:
+    _DECODE_ERRORS += (ijson.JSONError,)
+if msgpack is not None:
+    # FormatError and StackError carry no message; report them as malformed.
+    _DECODE_ERRORS += (msgpack.exceptions.UnpackException, msgpack.exceptions.ExtraData)
+_DATE_RE = re.compile(r"([0-9]{4})-([0-9]{2})-([0-9]{2})")
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+# Slotted items drop the per-instance __dict__. Before Python 3.10 the items
+# stay regular dataclasses: hand-written __slots__ would clash with the field
+# defaults, which dataclass stores as class attributes.
+_DATACLASS_OPTIONS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def _is_valid_ymd(year: int, month: int, day: int) -> bool:
+    if year < 1 or not 1 <= month <= 12 or day < 1:
+        return False
+    if day <= 28:
+        return True
+    if month == 2:
+        is_leap = year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+        return day <= 28 + is_leap
+    return day <= _DAYS_IN_MONTH[month - 1]
+
+
+def _is_canonical_date(value: str) -> bool:
+    match = _DATE_RE.fullmatch(value)
+    return match is not None and _is_valid_ymd(*map(int, match.groups()))
 
 
 def ensure_due_date_string(value: str) -> str:
@@ -25,6 +87,11 @@ def ensure_due_date_string(value: str) -> str:
     if not isinstance(value, str) or not value.strip():
         raise ValueError("Due date must be a non-empty YYYY-MM-DD string.")
     trimmed = value.strip()
+    if _DATE_RE.fullmatch(trimmed):
+        if _is_canonical_date(trimmed):
+            return trimmed
+        raise ValueError(f"Due date must follow {DATE_FORMAT} format.")
+    # strptime also accepts non-zero-padded fields such as 2024-1-5.
     try:
         datetime.strptime(trimmed, DATE_FORMAT)
     except ValueError as exc:  # pragma: no cover - straightforward validation
@@ -81,7 +148,12 @@ def _require_date_or_none(value: Any, index: int) -> Optional[str]:
         raise ValueError(
             f"Row {index + 1}: due_date must be null or a {DATE_FORMAT} string."
         )
-    ensure_due_date_string(value)
+    try:
+        ensure_due_date_string(value)
+    except ValueError:
+        raise ValueError(
+            f"Row {index + 1}: due_date must be null or a {DATE_FORMAT} string."
+        ) from None
     return value.strip()
 
 
@@ -101,35 +173,92 @@ def _normalize_item_type(
     return candidate
 
 
+def _loads(raw: Any) -> Any:
+    """Decode a JSON bytes-like object, preferring orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(bytes(raw))
+
+
+_to_dict = operator.methodcaller("to_dict")
+_is_unsaved = operator.attrgetter("_unsaved")
+
+
+def _dumps(payload: Any, pretty: bool = False) -> bytes:
+    """Encode ``payload`` as JSON bytes, indented only when ``pretty`` is set.
+
+    Items are converted through ``to_dict`` one at a time while encoding, so
+    no list of intermediate dicts is built for the whole collection.
+    """
+    if orjson is not None:
+        option = orjson.OPT_PASSTHROUGH_DATACLASS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(payload, default=_to_dict, option=option)
+    if pretty:
+        return json.dumps(payload, default=_to_dict, indent=2).encode("utf-8")
+    return json.dumps(payload, default=_to_dict, separators=(",", ":")).encode("utf-8")
+
+
+def _encode_item(item: Item) -> bytes:
+    """Encode a single item as compact JSON bytes, reusing its cached encoding.
+
+    The cache records the field values it was encoded from and is only reused
+    while they are unchanged, so direct field assignments are still saved.
+    """
+    key = item._json_key(item)
+    cached = item._json_cache
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    if orjson is not None:
+        encoded = orjson.dumps(item.to_dict())
+    else:
+        encoded = json.dumps(item.to_dict(), separators=(",", ":")).encode("utf-8")
+    item._json_cache = (key, encoded)
+    return encoded
+
+
+def _encode_items(items: List[Item]) -> bytes:
+    """Encode items as a compact JSON array; only changed items are re-encoded."""
+    return b"[" + b",".join(map(_encode_item, items)) + b"]"
+
+
 def _normalize_json_row(row: Dict[str, Any], index: int) -> Dict[str, Any]:
     if not isinstance(row, dict):
         raise ValueError(f"Row {index + 1}: each entry must be a JSON object.")
 
-    normalized: Dict[str, Any] = dict(row)
-    normalized["id"] = _require_positive_int(row.get("id"), "id", index)
-    normalized["title"] = _require_string(row.get("title"), "title", index)
-    normalized["is_checked_out"] = _require_bool(row.get("is_checked_out"), index)
-    normalized["due_date"] = _require_date_or_none(row.get("due_date"), index)
-
+    item_id = _require_positive_int(row.get("id"), "id", index)
+    title = _require_string(row.get("title"), "title", index)
+    is_checked_out = _require_bool(row.get("is_checked_out"), index)
+    due_date = _require_date_or_none(row.get("due_date"), index)
     item_type = _normalize_item_type(row.get("type"), row.get("item_type"), index)
-    normalized["type"] = item_type
-    normalized["item_type"] = item_type
 
     if item_type == "Book":
-        normalized["author"] = _require_string(row.get("author"), "author", index)
-        normalized["pages"] = _require_positive_int(row.get("pages"), "pages", index)
+        type_fields: Dict[str, Any] = {
+            "author": _require_string(row.get("author"), "author", index),
+            "pages": _require_positive_int(row.get("pages"), "pages", index),
+        }
     else:
         duration_source = row.get("duration", row.get("duration_minutes"))
-        normalized["duration"] = _require_positive_int(
-            duration_source, "duration", index
-        )
-        normalized["duration_minutes"] = normalized["duration"]
-        normalized["rating"] = _require_rating(row.get("rating"), index)
+        duration = _require_positive_int(duration_source, "duration", index)
+        type_fields = {
+            "duration": duration,
+            "duration_minutes": duration,
+            "rating": _require_rating(row.get("rating"), index),
+        }
 
-    return normalized
+    return {
+        "id": item_id,
+        "title": title,
+        "is_checked_out": is_checked_out,
+        "due_date": due_date,
+        "type": item_type,
+        "item_type": item_type,
+        **type_fields,
+    }
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Item:
     """Base representation for all library items."""
 
@@ -137,18 +266,61 @@ class Item:
     is_checked_out: bool = False
     due_date: Optional[str] = None
     id: Optional[int] = None
-
-    _id_counter: ClassVar[int] = 1
+    _haystack: str = field(default="", init=False, repr=False, compare=False)
+    _sort_title: str = field(default="", init=False, repr=False, compare=False)
+    _sort_due: Tuple[bool, str] = field(
+        default=(True, ""), init=False, repr=False, compare=False
+    )
+    _json_cache: Optional[Tuple[Tuple[Any, ...], bytes]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Set by the mutators and cleared when a repository saves the item.
+    _unsaved: bool = field(default=False, init=False, repr=False, compare=False)
+
+    _id_counter: ClassVar[Iterator[int]] = count(1)
+    # JSON keys written for a subclass field, when not just the field name.
+    _json_aliases: ClassVar[Dict[str, Tuple[str, ...]]] = {}
+    # The class name, looked up once per class instead of per item.
+    _type_name: ClassVar[str] = "Item"
+    # Returns the public field values; set for each class below.
+    _json_key: ClassVar[Callable[[Any], Tuple[Any, ...]]]
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        # Zero-argument super() fails here once dataclass rebuilds Item with slots.
+        super(Item, cls).__init_subclass__(**kwargs)
+        cls._type_name = cls.__name__
 
     def __post_init__(self) -> None:
         if self.id is None:
             self.id = self._generate_id()
+        self._refresh_caches()
+
+    def _refresh_caches(self) -> None:
+        """Recompute the search text and sort keys and drop the cached JSON."""
+        self._haystack = " ".join(
+            filter(
+                None,
+                [str(self.id), self.title, self._type_name, getattr(self, "author", "")],
+            )
+        ).lower()
+        self._sort_title = self.title.lower()
+        self._sort_due = (self.due_date is None, self.due_date or "")
+        self._json_cache = None
+
+    def _changed(self) -> None:
+        """Bring derived data up to date after a mutator changed fields."""
+        self._refresh_caches()
+        self._unsaved = True
+
+    def update(self, **changes: Any) -> None:
+        """Assign new field values and keep cached derived data in sync."""
+        for name, value in changes.items():
+            setattr(self, name, value)
+        self._changed()
 
     @classmethod
     def _generate_id(cls) -> int:
-        assigned_id = Item._id_counter
-        Item._id_counter += 1
-        return assigned_id
+        return next(Item._id_counter)
 
     def check_out(self, days: int) -> None:
         if self.is_checked_out:
@@ -162,15 +334,17 @@ class Item:
         due_date = (datetime.today() + timedelta(days=days_int)).strftime(DATE_FORMAT)
         self.is_checked_out = True
         self.due_date = due_date
+        self._changed()
 
     def return_item(self) -> None:
         if not self.is_checked_out:
             raise ValueError(f"Item '{self.title}' is not currently checked out.")
         self.is_checked_out = False
         self.due_date = None
+        self._changed()
 
     def to_dict(self) -> Dict[str, object]:  # pragma: no cover - simple serialization
-        item_type = self.__class__.__name__
+        item_type = self._type_name
         return {
             "id": self.id,
             "title": self.title,
@@ -181,13 +355,13 @@ class Item:
         }
 
     @classmethod
-    def from_dict(cls, payload: Dict[str, object]) -> "Item":
+    def from_dict(cls, payload: Mapping[str, object]) -> "Item":
         item_type = payload.get("item_type", payload.get("type", "Item"))
-        target_cls = ITEM_TYPE_REGISTRY.get(str(item_type), Item)
-        return target_cls._deserialize(payload)
+        deserialize = _DESERIALIZERS.get(str(item_type), _DESERIALIZERS["Item"])
+        return deserialize(payload)
 
     @classmethod
-    def _deserialize(cls, payload: Dict[str, object]) -> "Item":
+    def _deserialize(cls, payload: Mapping[str, object]) -> "Item":
         return cls(
             title=str(payload.get("title", "Untitled")),
             is_checked_out=bool(payload.get("is_checked_out", False)),
@@ -196,27 +370,19 @@ class Item:
         )
 
     @classmethod
-    def sync_id_counter(cls, items: List["Item"]) -> None:
-        if not items:
-            Item._id_counter = 1
-            return
-        Item._id_counter = max(item.id or 0 for item in items) + 1
+    def set_next_id(cls, next_id: int) -> None:
+        Item._id_counter = count(next_id)
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Book(Item):
     """Represents a book in the collection."""
 
     author: str = "Unknown"
     pages: int = 1
 
-    def to_dict(self) -> Dict[str, object]:  # pragma: no cover - simple serialization
-        data = super().to_dict()
-        data.update({"author": self.author, "pages": self.pages})
-        return data
-
     @classmethod
-    def _deserialize(cls, payload: Dict[str, object]) -> "Book":
+    def _deserialize(cls, payload: Mapping[str, object]) -> "Book":
         return cls(
             title=str(payload.get("title", "Untitled")),
             author=str(payload.get("author", "Unknown")),
@@ -227,22 +393,19 @@ class Book(Item):
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class DVD(Item):
     """Represents a DVD in the collection."""
 
     duration: int = 1
     rating: int = 3
 
-    def to_dict(self) -> Dict[str, object]:  # pragma: no cover - simple serialization
-        data = super().to_dict()
-        data.update(
-            {"duration": self.duration, "duration_minutes": self.duration, "rating": self.rating}
-        )
-        return data
+    _json_aliases: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        "duration": ("duration", "duration_minutes")
+    }
 
     @classmethod
-    def _deserialize(cls, payload: Dict[str, object]) -> "DVD":
+    def _deserialize(cls, payload: Mapping[str, object]) -> "DVD":
         duration_value = payload.get("duration", payload.get("duration_minutes", 1))
         return cls(
             title=str(payload.get("title", "Untitled")),
@@ -254,86 +417,439 @@ class DVD(Item):
         )
 
 
+def _compile_to_dict(cls: Type[Item]) -> None:
+    """Give ``cls`` a to_dict that builds its JSON dict in one literal.
+
+    The source is generated from the dataclass fields, so each subclass gets
+    a flat function instead of chaining to Item.to_dict and update()-ing the
+    result. Key order matches Item.to_dict followed by the subclass fields.
+    """
+    base_fields = [f.name for f in fields(Item) if not f.name.startswith("_")]
+    key_order = ["id"] + [name for name in base_fields if name != "id"]
+    entries = [f'"{name}": self.{name}' for name in key_order]
+    entries += [f'"item_type": {cls._type_name!r}', f'"type": {cls._type_name!r}']
+    for item_field in fields(cls):
+        name = item_field.name
+        if name in base_fields or name.startswith("_"):
+            continue
+        for key in cls._json_aliases.get(name, (name,)):
+            entries.append(f'"{key}": self.{name}')
+
+    source = "def to_dict(self):\n    return {%s}\n" % ", ".join(entries)
+    namespace: Dict[str, Any] = {}
+    exec(source, namespace)
+    to_dict = namespace["to_dict"]
+    to_dict.__qualname__ = f"{cls.__name__}.to_dict"
+    cls.to_dict = to_dict  # type: ignore[assignment]
+
+
+for _item_cls in (Item, Book, DVD):
+    _item_cls._json_key = operator.attrgetter(
+        *[f.name for f in fields(_item_cls) if not f.name.startswith("_")]
+    )
+for _item_cls in (Book, DVD):
+    _compile_to_dict(_item_cls)
+
+
 ITEM_TYPE_REGISTRY: Dict[str, Type[Item]] = {
     "Item": Item,
     "Book": Book,
     "DVD": DVD,
 }
 
+# Bound once here so from_dict skips the class lookup and method binding.
+_DESERIALIZERS: Dict[str, Callable[[Mapping[str, object]], Item]] = {
+    name: item_cls._deserialize for name, item_cls in ITEM_TYPE_REGISTRY.items()
+}
+
+
+def _build_book(row: Dict[str, Any]) -> Book:
+    return Book(
+        title=row["title"],
+        author=row["author"],
+        pages=row["pages"],
+        is_checked_out=row["is_checked_out"],
+        due_date=row["due_date"],
+        id=row["id"],
+    )
+
+
+def _build_dvd(row: Dict[str, Any]) -> DVD:
+    return DVD(
+        title=row["title"],
+        duration=row["duration"],
+        rating=row["rating"],
+        is_checked_out=row["is_checked_out"],
+        due_date=row["due_date"],
+        id=row["id"],
+    )
+
+
+# Normalized rows already carry validated, correctly typed values, so they
+# skip the defaults and coercions of Item.from_dict.
+_ROW_BUILDERS: Dict[str, Callable[[Dict[str, Any]], Item]] = {
+    "Book": _build_book,
+    "DVD": _build_dvd,
+}
+
+
+def _column(rows: List[Dict[str, Any]], key: str) -> List[Any]:
+    return list(map(dict.get, rows, repeat(key)))
+
+
+def _all_of_type(values: List[Any], expected: type) -> bool:
+    return set(map(type, values)) <= {expected}
+
+
+def _ints_in_range(values: List[int], low: int, high: Optional[int] = None) -> bool:
+    if not values:
+        return True
+    if min(values) < low:
+        return False
+    return high is None or max(values) <= high
+
+
+def _is_clean_due_date(value: Any) -> bool:
+    if value is None:
+        return True
+    return type(value) is str and _is_canonical_date(value)
+
+
+def _build_items_fast(rows: List[Any]) -> Optional[List[Item]]:
+    """Validate well-formed rows column by column and build their items.
+
+    Returns None when any value needs coercion or is invalid; the caller then
+    re-validates row by row to get the lenient conversions and the row-numbered
+    error messages of ``_normalize_json_row``.
+    """
+    if not _all_of_type(rows, dict):
+        return None
+    ids = _column(rows, "id")
+    titles = _column(rows, "title")
+    checked = _column(rows, "is_checked_out")
+    due_dates = _column(rows, "due_date")
+    types = _column(rows, "type")
+    if not (
+        _all_of_type(ids, int)
+        and _ints_in_range(ids, 1)
+        and _all_of_type(titles, str)
+        and _all_of_type(checked, bool)
+        and _all_of_type(types, str)
+        and set(types) <= VALID_ITEM_TYPES
+    ):
+        return None
+    titles = list(map(str.strip, titles))
+    if not all(titles) or not all(map(_is_clean_due_date, due_dates)):
+        return None
+
+    is_book = list(map("Book".__eq__, types))
+    books = list(compress(rows, is_book))
+    dvds = list(compress(rows, map(operator.not_, is_book)))
+    authors = _column(books, "author")
+    pages = _column(books, "pages")
+    durations = _column(dvds, "duration")
+    ratings = _column(dvds, "rating")
+    if not (
+        _all_of_type(authors, str)
+        and _all_of_type(pages, int)
+        and _ints_in_range(pages, 1)
+        and _all_of_type(durations, int)
+        and _ints_in_range(durations, 1)
+        and _all_of_type(ratings, int)
+        and _ints_in_range(ratings, 1, 5)
+    ):
+        return None
+    authors = list(map(str.strip, authors))
+    if not all(authors):
+        return None
+
+    book_fields = zip(authors, pages)
+    dvd_fields = zip(durations, ratings)
+    items: List[Item] = []
+    for item_id, title, is_checked_out, due_date, book in zip(
+        ids, titles, checked, due_dates, is_book
+    ):
+        if book:
+            author, page_count = next(book_fields)
+            items.append(
+                Book(
+                    title=title,
+                    author=author,
+                    pages=page_count,
+                    is_checked_out=is_checked_out,
+                    due_date=due_date,
+                    id=item_id,
+                )
+            )
+        else:
+            duration, rating = next(dvd_fields)
+            items.append(
+                DVD(
+                    title=title,
+                    duration=duration,
+                    rating=rating,
+                    is_checked_out=is_checked_out,
+                    due_date=due_date,
+                    id=item_id,
+                )
+            )
+    return items
+
+
+def _has_display() -> bool:
+    """Whether a Tk window could open; without X11 or Wayland, Tk() only fails slowly."""
+    if sys.platform in ("win32", "darwin"):
+        return True
+    return bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
 
 class LibraryRepository:
     """Handles persistence and validation for library items."""
 
-    def __init__(self, json_path: str = "items.json") -> None:
+    APPEND_TAIL_BYTES = 4096
+    STREAM_CHUNK_ROWS = 1024
+
+    def __init__(self, json_path: str = "items.json", pretty: bool = False) -> None:
+        """Open the collection stored at ``json_path``, creating it if missing.
+
+        A path ending in ``.msgpack`` stores items as MessagePack instead of
+        JSON; that needs the optional msgpack package and raises RuntimeError
+        without it.
+        """
         self.json_path = json_path
+        self.pretty = pretty
+        self.use_msgpack = json_path.endswith(MSGPACK_SUFFIX)
+        if self.use_msgpack and msgpack is None:
+            raise RuntimeError(
+                f"Install msgpack to store items in a {MSGPACK_SUFFIX} file."
+            )
+        self.format_name = "MessagePack" if self.use_msgpack else "JSON"
         self.items: List[Item] = []
+        self._by_id: Dict[int, Item] = {}
+        self._dirty = False
+        self._batch_depth = 0
         self.load_items()
 
     def load_items(self) -> None:
+        """Read the items from disk, discarding any unsaved changes."""
         if not os.path.exists(self.json_path):
-            self.items = []
+            self._set_items([])
             self.save_items()
             return
 
         try:
-            with open(self.json_path, "r", encoding="utf-8") as stream:
-                data = json.load(stream)
-            normalized_rows = self._normalize_rows(data)
-            self.items = [Item.from_dict(blob) for blob in normalized_rows]
-            Item.sync_id_counter(self.items)
-        except json.JSONDecodeError:
-            if self._prompt_reset_invalid_json("The JSON file is malformed."):
-                self.items = []
+            if self._should_stream():
+                self._set_items(self._stream_items())
+            else:
+                self._set_items(self._build_items(self._read_payload()))
+            # The id index already holds every loaded id as an int key.
+            Item.set_next_id(max(self._by_id, default=0) + 1)
+        except _DECODE_ERRORS:  # orjson.JSONDecodeError subclasses json's
+            if self._prompt_reset_invalid_json(f"The {self.format_name} file is malformed."):
+                self._set_items([])
                 self.save_items()
             else:
                 raise
         except ValueError as exc:
             if self._prompt_reset_invalid_json(str(exc)):
-                self.items = []
+                self._set_items([])
                 self.save_items()
             else:
                 raise
 
-    def _normalize_rows(self, payload: Any) -> List[Dict[str, Any]]:
+    def _read_payload(self) -> Any:
+        """Decode the file from a read-only memory map, without a read() copy."""
+        with open(self.json_path, "rb") as stream:
+            if os.fstat(stream.fileno()).st_size == 0:
+                return self._decode(b"")  # mmap rejects empty files; raise the decode error
+            with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    return self._decode(view)
+
+    def _decode(self, raw: Any) -> Any:
+        if self.use_msgpack:
+            return msgpack.unpackb(raw, raw=False)
+        return _loads(raw)
+
+    def _encode(self) -> bytes:
+        if self.use_msgpack:
+            return msgpack.packb(list(map(_to_dict, self.items)), use_bin_type=True)
+        if self.pretty:
+            return _dumps(self.items, True)
+        return _encode_items(self.items)
+
+    def _should_stream(self) -> bool:
+        """Stream only large files whose top level is a JSON array."""
+        if self.use_msgpack or ijson is None:
+            return False
+        if os.path.getsize(self.json_path) <= STREAMING_THRESHOLD_BYTES:
+            return False
+        with open(self.json_path, "rb") as stream:
+            head = stream.read(64).lstrip()
+        return head.startswith(b"[")
+
+    def _stream_items(self) -> List[Item]:
+        """Parse and build a bounded chunk of rows at a time to keep peak memory flat.
+
+        Each chunk takes the column-wise fast path when it can, so only the
+        chunks holding irregular rows are validated row by row.
+        """
+        items: List[Item] = []
+        with open(self.json_path, "rb") as stream:
+            rows = ijson.items(stream, "item")
+            start = 0
+            while True:
+                chunk = list(islice(rows, self.STREAM_CHUNK_ROWS))
+                if not chunk:
+                    return items
+                built = _build_items_fast(chunk)
+                if built is None:
+                    built = [
+                        _ROW_BUILDERS[row["type"]](row)
+                        for row in map(_normalize_json_row, chunk, count(start))
+                    ]
+                items.extend(built)
+                start += len(chunk)
+
+    def _set_items(self, items: List[Item]) -> None:
+        self.items = items
+        self._by_id = {item.id: item for item in items}
+
+    def _build_items(self, payload: Any, format_name: Optional[str] = None) -> List[Item]:
+        """Validate decoded rows and construct their items in a single pass.
+
+        ``format_name`` names the source in errors; it defaults to the storage format.
+        """
         if payload in (None, ""):
             return []
         if not isinstance(payload, list):
-            raise ValueError("Items JSON must contain a list of records.")
-        return [_normalize_json_row(row, idx) for idx, row in enumerate(payload)]
+            raise ValueError(
+                f"Items {format_name or self.format_name} must contain a list of records."
+            )
+        items = _build_items_fast(payload)
+        if items is not None:
+            return items
+        return [
+            _ROW_BUILDERS[row["type"]](row)
+            for row in map(_normalize_json_row, payload, count())
+        ]
 
     def save_items(self) -> None:
-        serialized = [item.to_dict() for item in self.items]
-        with open(self.json_path, "w", encoding="utf-8") as stream:
-            json.dump(serialized, stream, indent=2)
+        """Rewrite the file atomically so an interrupted save cannot corrupt it."""
+        tmp_path = f"{self.json_path}.tmp"
+        with open(tmp_path, "wb") as stream:
+            stream.write(self._encode())
+        os.replace(tmp_path, self.json_path)
+        self._dirty = False
+        for item in filter(_is_unsaved, self.items):
+            item._unsaved = False
+
+    def mark_dirty(self) -> None:
+        """Record an in-place item change so the next flush writes it out."""
+        self._dirty = True
+
+    def flush(self) -> None:
+        """Write items to disk only if changes are pending."""
+        if self._dirty:
+            self.save_items()
+
+    @contextmanager
+    def batch(self) -> Iterator["LibraryRepository"]:
+        """Defer the writes of add_item/delete_item to one save at block exit."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.flush()
+
+    def _persist(self) -> None:
+        if self._batch_depth:
+            self._dirty = True
+        else:
+            self.save_items()
 
     def add_item(self, item: Item) -> None:
         self.items.append(item)
-        self.save_items()
+        self._by_id[item.id] = item
+        # Append only while the file is known to match every other item.
+        if (
+            self._batch_depth
+            or self._dirty
+            or any(map(_is_unsaved, self.items))
+            or not self._append_item(item)
+        ):
+            self._persist()
+
+    def _append_item(self, item: Item) -> bool:
+        """Splice one item in front of the closing bracket of the JSON array.
+
+        Writes only the new record instead of the whole collection. Returns
+        False, leaving the file untouched, if its tail is not a recognizable
+        array close, the file is MessagePack, or it is kept indented (the
+        record would be compact); the caller then rewrites the file in full.
+
+        Unlike save_items, this overwrites the closing bracket in place. The
+        write is fsynced before returning, but a crash part-way through it
+        can still leave the array unterminated.
+        """
+        if self.use_msgpack or self.pretty:
+            return False
+        try:
+            with open(self.json_path, "r+b") as stream:
+                end = stream.seek(0, os.SEEK_END)
+                tail_start = max(0, end - self.APPEND_TAIL_BYTES)
+                stream.seek(tail_start)
+                body = stream.read().rstrip()
+                before_close = body[:-1].rstrip()
+                if not body.endswith(b"]") or not before_close:
+                    return False
+                separator = b"" if before_close.endswith(b"[") else b","
+                stream.seek(tail_start + len(body) - 1)
+                stream.write(separator + _encode_item(item) + b"]")
+                stream.truncate()
+                stream.flush()
+                os.fsync(stream.fileno())
+        except OSError:
+            return False
+        return True
 
     def delete_item(self, item_id: int) -> None:
-        self.items = [item for item in self.items if item.id != item_id]
-        self.save_items()
+        if self._by_id.pop(item_id, None) is not None:
+            self.items = [item for item in self.items if item.id != item_id]
+        self._persist()
+
+    def export_json(self, path: str) -> None:
+        """Write every item to ``path`` as JSON, whatever the storage format."""
+        with open(path, "wb") as stream:
+            stream.write(_dumps(self.items, self.pretty))
+
+    def import_json(self, path: str) -> None:
+        """Replace all items with the validated records of a JSON file."""
+        with open(path, "rb") as stream:
+            items = self._build_items(_loads(stream.read()), "JSON")
+        self._set_items(items)
+        Item.set_next_id(max(self._by_id, default=0) + 1)
+        self._persist()
 
     def get_all_items(self) -> List[Item]:
         return list(self.items)
 
     def get_item_by_id(self, item_id: int) -> Optional[Item]:
-        for item in self.items:
-            if item.id == item_id:
-                return item
-        return None
+        return self._by_id.get(item_id)
 
     def _prompt_reset_invalid_json(self, detail: str) -> bool:
         message = (
-            "The items JSON file contains invalid data.\n"
+            f"The items {self.format_name} file contains invalid data.\n"
             f"Details: {detail}\n\n"
             "Would you like to reset it to an empty collection?"
         )
-        if tk and messagebox:
+        if tk and messagebox and _has_display():
             try:
                 root = tk.Tk()
                 root.withdraw()
-                response = messagebox.askyesno("Invalid JSON", message)
+                response = messagebox.askyesno(f"Invalid {self.format_name}", message)
                 root.destroy()
                 return bool(response)
             except Exception:
@@ -361,6 +877,16 @@ class LibraryApp:
     TREE_HEADER_BG = "#222222"
     TREE_SELECTION_BG = "#444444"
     SCROLLBAR_BG = "#222222"
+    FLUSH_DELAY_MS = 500
+    SEARCH_DELAY_MS = 150
+    RENDER_CHUNK = 200
+    SORT_KEYS = {
+        "id": operator.attrgetter("id"),
+        "title": operator.attrgetter("_sort_title"),
+        "type": operator.attrgetter("_type_name"),
+        "status": operator.attrgetter("is_checked_out"),
+        "due_date": operator.attrgetter("_sort_due"),
+    }
 
     def __init__(self, json_path: str = "items.json") -> None:
         if tk is None or ttk is None or messagebox is None:
@@ -369,13 +895,20 @@ class LibraryApp:
         self.repo = LibraryRepository(json_path)
         self.root = tk.Tk()
         self.root.title("Library Manager")
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        self._flush_after_id: Optional[str] = None
         self.style = ttk.Style(self.root)
         self._configure_styles()
 
+        self._search_after_id: Optional[str] = None
         self.search_var = tk.StringVar()
-        self.search_var.trace_add("write", lambda *_: self.refresh_table())
+        self.search_var.trace_add("write", lambda *_: self._schedule_search_refresh())
         self.sort_column = "id"
         self.sort_reverse = False
+        self._row_values: Dict[str, Tuple[Any, ...]] = {}
+        self._last_match: Optional[Tuple[str, List[Item]]] = None
+        self._matches: List[Item] = []
+        self._render_more_pending = False
 
         self.tree: ttk.Treeview
         self._build_ui()
@@ -384,6 +917,26 @@ class LibraryApp:
     def run(self) -> None:
         self.root.mainloop()
 
+    def _on_close(self) -> None:
+        self._cancel_pending_flush()
+        self.repo.flush()
+        self.root.destroy()
+
+    def _mark_changed(self) -> None:
+        """Flag the repository dirty and coalesce writes into one delayed flush."""
+        self.repo.mark_dirty()
+        self._cancel_pending_flush()
+        self._flush_after_id = self.root.after(self.FLUSH_DELAY_MS, self._flush_pending)
+
+    def _cancel_pending_flush(self) -> None:
+        if self._flush_after_id is not None:
+            self.root.after_cancel(self._flush_after_id)
+            self._flush_after_id = None
+
+    def _flush_pending(self) -> None:
+        self._flush_after_id = None
+        self.repo.flush()
+
     def _build_ui(self) -> None:
         search_frame = ttk.Frame(self.root, padding=(10, 10, 10, 0))
         search_frame.pack(fill="x")
@@ -417,10 +970,12 @@ class LibraryApp:
             )
             self.tree.column(column, anchor="center")
 
-        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        self._scrollbar = ttk.Scrollbar(
+            tree_frame, orient="vertical", command=self.tree.yview
+        )
+        self.tree.configure(yscrollcommand=self._on_tree_scroll)
         self.tree.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        self._scrollbar.pack(side="right", fill="y")
 
         self.tree.bind("<Double-1>", self.show_item_details)
 
@@ -441,52 +996,118 @@ class LibraryApp:
                 side="left", padx=5, pady=5
             )
 
-    def refresh_table(self) -> None:
-        for row in self.tree.get_children():
-            self.tree.delete(row)
+    def refresh_table(self, narrow: bool = False, reset_view: bool = False) -> None:
+        """Re-filter the items and render the leading rows of the result.
+
+        In-place refreshes keep as many rows as were already rendered (at least
+        RENDER_CHUNK). With ``reset_view``, used for a new query or sort order,
+        the view jumps back to the top and only RENDER_CHUNK rows are rendered,
+        however far the user had scrolled. Further rows are added as the view
+        nears the bottom.
+        """
+        self._matches = self._get_filtered_items(narrow)
+        if reset_view:
+            self._render_rows(self.RENDER_CHUNK)
+            self.tree.yview_moveto(0)
+        else:
+            self._render_rows(max(self.RENDER_CHUNK, len(self._row_values)))
+
+    def _on_tree_scroll(self, first: str, last: str) -> None:
+        self._scrollbar.set(first, last)
+        if (
+            float(last) > 0.9
+            and len(self._row_values) < len(self._matches)
+            and not self._render_more_pending
+        ):
+            self._render_more_pending = True
+            self.root.after_idle(self._render_more)
+
+    def _render_more(self) -> None:
+        self._render_more_pending = False
+        self._render_rows(len(self._row_values) + self.RENDER_CHUNK)
 
-        items = self._get_filtered_items()
-        for item in items:
+    def _render_rows(self, limit: int) -> None:
+        """Sync the tree with the first ``limit`` matches, touching only rows that changed."""
+        rows: Dict[str, Tuple[Any, ...]] = {}
+        for item in self._matches[:limit]:
             status = "Checked Out" if item.is_checked_out else "Available"
             due_date = item.due_date or ""
-            self.tree.insert(
-                "",
-                "end",
-                iid=str(item.id),
-                values=(item.id, item.title, item.__class__.__name__, status, due_date),
+            rows[str(item.id)] = (
+                item.id, item.title, item._type_name, status, due_date
             )
 
-    def _get_filtered_items(self) -> List[Item]:
+        previous = self._row_values
+        stale = previous.keys() - rows.keys()
+        if stale:
+            self.tree.delete(*stale)
+        current_order = [iid for iid in previous if iid in rows]
+        inserted: List[Tuple[str, Tuple[Any, ...]]] = []
+        updated: List[Tuple[str, Tuple[Any, ...]]] = []
+        for iid, values in rows.items():
+            old_values = previous.get(iid)
+            if old_values is None:
+                inserted.append((iid, values))
+                current_order.append(iid)
+            elif old_values != values:
+                updated.append((iid, values))
+        self._write_rows(inserted, updated)
+
+        new_order = list(rows)
+        if current_order != new_order:
+            self.tree.set_children("", *new_order)
+        self._row_values = rows
+
+    def _write_rows(
+        self,
+        inserted: List[Tuple[str, Tuple[Any, ...]]],
+        updated: List[Tuple[str, Tuple[Any, ...]]],
+    ) -> None:
+        """Push row values straight to Tcl.
+
+        Treeview.insert/item re-format and quote every value in Python on each
+        call; tk.call converts the values tuple to a Tcl list natively.
+        """
+        call = self.tree.tk.call
+        path = str(self.tree)
+        for iid, values in inserted:
+            call(path, "insert", "", "end", "-id", iid, "-values", values)
+        for iid, values in updated:
+            call(path, "item", iid, "-values", values)
+
+    def _schedule_search_refresh(self) -> None:
+        """Refresh once typing pauses instead of on every keystroke."""
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(
+            self.SEARCH_DELAY_MS, self._run_search_refresh
+        )
+
+    def _run_search_refresh(self) -> None:
+        self._search_after_id = None
+        self.refresh_table(narrow=True, reset_view=True)
+
+    def _get_filtered_items(self, narrow: bool = False) -> List[Item]:
+        """Return matching items, sorted.
+
+        With ``narrow`` set, a query that extends the previous one is matched
+        against the previous hits only. Callers pass it only when the items
+        themselves have not changed since the last refresh.
+        """
         query = self.search_var.get().strip().lower()
-        items = self.repo.get_all_items()
-        if query:
-            filtered: List[Item] = []
-            for item in items:
-                haystack = " ".join(
-                    filter(
-                        None,
-                        [
-                            str(item.id),
-                            item.title,
-                            item.__class__.__name__,
-                            getattr(item, "author", ""),
-                        ],
-                    )
-                ).lower()
-                if query in haystack:
-                    filtered.append(item)
-            items = filtered
+        if not query:
+            self._last_match = None
+            return self._sort_items(self.repo.get_all_items())
+        last = self._last_match
+        if narrow and last is not None and query.startswith(last[0]):
+            candidates = last[1]
+        else:
+            candidates = self.repo.get_all_items()
+        items = [item for item in candidates if query in item._haystack]
+        self._last_match = (query, items)
         return self._sort_items(items)
 
     def _sort_items(self, items: List[Item]) -> List[Item]:
-        key_map = {
-            "id": lambda i: i.id or 0,
-            "title": lambda i: i.title.lower(),
-            "type": lambda i: i.__class__.__name__,
-            "status": lambda i: i.is_checked_out,
-            "due_date": lambda i: (i.due_date is None, i.due_date or ""),
-        }
-        key_fn = key_map.get(self.sort_column, key_map["id"])
+        key_fn = self.SORT_KEYS.get(self.sort_column, self.SORT_KEYS["id"])
         return sorted(items, key=key_fn, reverse=self.sort_reverse)
 
     def sort_by_column(self, column: str) -> None:
@@ -495,7 +1116,7 @@ class LibraryApp:
         else:
             self.sort_column = column
             self.sort_reverse = False
-        self.refresh_table()
+        self.refresh_table(reset_view=True)
 
     def add_book(self) -> None:
         self._open_item_form("Book")
@@ -506,7 +1127,7 @@ class LibraryApp:
     def edit_item(self) -> None:
         item = self._require_selection("Select an item to edit.")
         if item:
-            self._open_item_form(item.__class__.__name__, item)
+            self._open_item_form(item._type_name, item)
 
     def delete_item(self) -> None:
         item = self._require_selection("Select an item to delete.")
@@ -535,7 +1156,7 @@ class LibraryApp:
         except ValueError as exc:
             messagebox.showerror("Invalid Checkout", str(exc), parent=self.root)
             return
-        self.repo.save_items()
+        self._mark_changed()
         self.refresh_table()
 
     def return_item(self) -> None:
@@ -546,10 +1167,11 @@ class LibraryApp:
             messagebox.showerror("Error", f"'{item.title}' is not checked out.", parent=self.root)
             return
         item.return_item()
-        self.repo.save_items()
+        self._mark_changed()
         self.refresh_table()
 
     def save_changes(self) -> None:
+        self._cancel_pending_flush()
         self.repo.save_items()
         messagebox.showinfo("Saved", "Items have been saved to disk.", parent=self.root)
 
@@ -557,7 +1179,7 @@ class LibraryApp:
         item = self._get_selected_item()
         if not item:
             return
-        details = [f"Title: {item.title}", f"Type: {item.__class__.__name__}"]
+        details = [f"Title: {item.title}", f"Type: {item._type_name}"]
         if isinstance(item, Book):
             details.append(f"Author: {item.author}")
             details.append(f"Pages: {item.pages}")
@@ -619,20 +1241,16 @@ class LibraryApp:
                         self.repo.add_item(Book(**payload))
                     else:
                         assert isinstance(item, Book)
-                        item.title = payload["title"]
-                        item.author = payload["author"]
-                        item.pages = payload["pages"]
-                        self.repo.save_items()
+                        item.update(**payload)
+                        self._mark_changed()
                 else:
                     payload = self._validate_dvd_payload(values)
                     if item is None:
                         self.repo.add_item(DVD(**payload))
                     else:
                         assert isinstance(item, DVD)
-                        item.title = payload["title"]
-                        item.duration = payload["duration"]
-                        item.rating = payload["rating"]
-                        self.repo.save_items()
+                        item.update(**payload)
+                        self._mark_changed()
             except ValueError as exc:
                 messagebox.showerror("Invalid Data", str(exc), parent=window)
                 return
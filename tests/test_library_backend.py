@@ -0,0 +1,370 @@
+import copy
+import json
+import os
+import pickle
+import tempfile
+import unittest
+
+import library_backend as lb
+
+
+class RepositoryTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = os.path.join(self._tmp.name, "items.json")
+
+    def read_rows(self):
+        with open(self.path, "rb") as stream:
+            return json.loads(stream.read())
+
+
+class SaveTests(RepositoryTestCase):
+    def test_direct_field_assignment_is_saved(self) -> None:
+        repo = lb.LibraryRepository(self.path)
+        book = lb.Book(title="Alpha", author="A", pages=10)
+        repo.add_item(book)
+        repo.save_items()
+
+        book.title = "Renamed"
+        repo.save_items()
+
+        self.assertEqual(self.read_rows()[0]["title"], "Renamed")
+
+
+class ItemTests(unittest.TestCase):
+    def test_update_refreshes_search_and_sort_keys(self) -> None:
+        book = lb.Book(title="Alpha", author="A", pages=10)
+
+        book.update(title="Renamed")
+
+        self.assertIn("renamed", book._haystack)
+        self.assertEqual(book._sort_title, "renamed")
+
+    def test_items_survive_copy_and_pickle(self) -> None:
+        book = lb.Book(title="Alpha", author="A", pages=10)
+        book.check_out(3)
+        for item in (book, lb.DVD(title="Film", duration=90, rating=4), lb.Item(title="x")):
+            for clone in (
+                copy.copy(item),
+                copy.deepcopy(item),
+                pickle.loads(pickle.dumps(item)),
+            ):
+                self.assertEqual(clone, item)
+                self.assertEqual(clone.to_dict(), item.to_dict())
+                self.assertEqual(clone._haystack, item._haystack)
+
+
+def _book_row(**overrides):
+    row = {
+        "id": 1,
+        "title": "Dune",
+        "is_checked_out": False,
+        "due_date": None,
+        "type": "Book",
+        "author": "Herbert",
+        "pages": 412,
+    }
+    row.update(overrides)
+    return row
+
+
+def _dvd_row(**overrides):
+    row = {
+        "id": 2,
+        "title": "Heat",
+        "is_checked_out": True,
+        "due_date": "2024-02-29",
+        "type": "DVD",
+        "duration": 170,
+        "rating": 4,
+    }
+    row.update(overrides)
+    return row
+
+
+def _build_row_by_row(rows):
+    normalized = [lb._normalize_json_row(row, index) for index, row in enumerate(rows)]
+    return [lb._ROW_BUILDERS[row["type"]](row).to_dict() for row in normalized]
+
+
+class ValidationTests(RepositoryTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.repo = lb.LibraryRepository(self.path)
+
+    def build(self, rows):
+        return [item.to_dict() for item in self.repo._build_items(rows)]
+
+    def test_fast_path_matches_row_by_row_for_clean_rows(self) -> None:
+        rows = [_book_row(), _dvd_row()]
+
+        fast = lb._build_items_fast(rows)
+
+        self.assertIsNotNone(fast)
+        self.assertEqual([item.to_dict() for item in fast], _build_row_by_row(rows))
+
+    def test_coercible_rows_match_row_by_row(self) -> None:
+        cases = [
+            _book_row(pages="7"),
+            _book_row(id="3"),
+            _book_row(title="  Padded  ", author=" Someone "),
+            _book_row(due_date=""),
+            _book_row(due_date=" 2024-01-05 ", is_checked_out=True),
+            _book_row(due_date="2024-1-5", is_checked_out=True),
+            _book_row(type=" Book "),
+            _book_row(type=None, item_type="Book"),
+            {key: value for key, value in _dvd_row(duration_minutes=95).items() if key != "duration"},
+            _dvd_row(rating="5"),
+        ]
+        for row in cases:
+            with self.subTest(row=row):
+                rows = [_book_row(id=10), row, _dvd_row(id=11)]
+                self.assertEqual(self.build(rows), _build_row_by_row(rows))
+
+    def test_invalid_rows_report_their_row_number(self) -> None:
+        cases = [
+            _book_row(id=0),
+            _book_row(title="   "),
+            _book_row(is_checked_out="no"),
+            _book_row(pages=-1),
+            _book_row(type="Magazine"),
+            _book_row(due_date="2023-02-29"),
+            _dvd_row(rating=6),
+            "not an object",
+        ]
+        for row in cases:
+            with self.subTest(row=row):
+                rows = [_book_row(id=10), _dvd_row(id=11), row]
+                with self.assertRaises(ValueError) as expected:
+                    lb._normalize_json_row(row, 2)
+                with self.assertRaises(ValueError) as actual:
+                    self.repo._build_items(rows)
+                self.assertEqual(str(actual.exception), str(expected.exception))
+                self.assertTrue(str(actual.exception).startswith("Row 3:"))
+
+    def test_due_date_edge_cases(self) -> None:
+        self.assertEqual(lb.ensure_due_date_string("2024-02-29"), "2024-02-29")
+        self.assertEqual(lb.ensure_due_date_string("2000-02-29"), "2000-02-29")
+        self.assertEqual(lb.ensure_due_date_string(" 2024-12-31 "), "2024-12-31")
+        self.assertEqual(lb.ensure_due_date_string("2024-1-5"), "2024-1-5")
+        for value in ("2023-02-29", "1900-02-29", "2024-04-31", "2024-13-01", "2024-00-10",
+                      "0000-01-01", "2024/01/05", "", "  ", None):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    lb.ensure_due_date_string(value)
+
+    def test_fast_date_check_agrees_with_strptime(self) -> None:
+        for value in ("2024-02-29", "2023-02-29", "2024-04-30", "2024-04-31", "1999-12-31"):
+            with self.subTest(value=value):
+                try:
+                    lb.datetime.strptime(value, lb.DATE_FORMAT)
+                except ValueError:
+                    expected = False
+                else:
+                    expected = True
+                self.assertEqual(lb._is_clean_due_date(value), expected)
+
+
+class AddItemTests(RepositoryTestCase):
+    def test_add_after_item_api_change_saves_the_change(self) -> None:
+        repo = lb.LibraryRepository(self.path)
+        book = lb.Book(title="a", author="A", pages=1)
+        repo.add_item(book)
+
+        book.check_out(3)
+        repo.add_item(lb.DVD(title="d", duration=90, rating=3))
+
+        rows = self.read_rows()
+        self.assertEqual([row["title"] for row in rows], ["a", "d"])
+        self.assertTrue(rows[0]["is_checked_out"])
+
+    def test_add_after_update_saves_the_change(self) -> None:
+        repo = lb.LibraryRepository(self.path)
+        book = lb.Book(title="a", author="A", pages=1)
+        repo.add_item(book)
+
+        book.update(title="b")
+        repo.add_item(lb.DVD(title="d", duration=90, rating=3))
+
+        self.assertEqual([row["title"] for row in self.read_rows()], ["b", "d"])
+
+    def test_pretty_repository_stays_indented(self) -> None:
+        repo = lb.LibraryRepository(self.path, pretty=True)
+        repo.add_item(lb.Book(title="a", author="A", pages=1))
+        repo.add_item(lb.DVD(title="d", duration=90, rating=3))
+
+        with open(self.path, "rb") as stream:
+            self.assertEqual(stream.read(), lb._dumps(repo.items, pretty=True))
+
+
+class BatchTests(RepositoryTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.repo = lb.LibraryRepository(self.path)
+        self.saves = 0
+        save_items = self.repo.save_items
+
+        def counting_save() -> None:
+            self.saves += 1
+            save_items()
+
+        self.repo.save_items = counting_save  # type: ignore[assignment]
+
+    def test_writes_once_at_block_exit(self) -> None:
+        with self.repo.batch():
+            self.repo.add_item(lb.Book(title="a", author="A", pages=1))
+            dvd = lb.DVD(title="d", duration=90, rating=3)
+            self.repo.add_item(dvd)
+            self.repo.delete_item(dvd.id)
+            self.assertEqual(self.saves, 0)
+            self.assertEqual(self.read_rows(), [])
+
+        self.assertEqual(self.saves, 1)
+        self.assertEqual([row["title"] for row in self.read_rows()], ["a"])
+
+    def test_nested_batches_write_once_at_outermost_exit(self) -> None:
+        with self.repo.batch():
+            with self.repo.batch():
+                self.repo.add_item(lb.Book(title="a", author="A", pages=1))
+            self.assertEqual(self.saves, 0)
+            self.repo.add_item(lb.Book(title="b", author="B", pages=2))
+
+        self.assertEqual(self.saves, 1)
+        self.assertEqual([row["title"] for row in self.read_rows()], ["a", "b"])
+
+    def test_flushes_when_the_block_raises(self) -> None:
+        with self.assertRaises(RuntimeError):
+            with self.repo.batch():
+                self.repo.add_item(lb.Book(title="a", author="A", pages=1))
+                raise RuntimeError("boom")
+
+        self.assertEqual(self.saves, 1)
+        self.assertEqual([row["title"] for row in self.read_rows()], ["a"])
+
+    def test_empty_batch_does_not_write(self) -> None:
+        with self.repo.batch():
+            pass
+
+        self.assertEqual(self.saves, 0)
+
+    def test_save_leaves_no_temporary_file(self) -> None:
+        with self.repo.batch():
+            self.repo.add_item(lb.Book(title="a", author="A", pages=1))
+
+        self.assertEqual(os.listdir(self._tmp.name), ["items.json"])
+
+
+class AppendTests(RepositoryTestCase):
+    def test_splices_into_empty_array(self) -> None:
+        repo = lb.LibraryRepository(self.path)
+        book = lb.Book(title="a", author="A", pages=1)
+
+        self.assertTrue(repo._append_item(book))
+
+        self.assertEqual(self.read_rows(), [book.to_dict()])
+
+    def test_splices_into_non_empty_array(self) -> None:
+        first = lb.Book(title="a", author="A", pages=1)
+        with open(self.path, "w") as stream:
+            json.dump([first.to_dict()], stream, indent=2)
+            stream.write("\n")
+        repo = lb.LibraryRepository(self.path)
+        dvd = lb.DVD(title="d", duration=90, rating=3)
+
+        self.assertTrue(repo._append_item(dvd))
+
+        self.assertEqual(self.read_rows(), [first.to_dict(), dvd.to_dict()])
+
+    def test_leaves_non_array_tail_untouched(self) -> None:
+        repo = lb.LibraryRepository(self.path)
+        with open(self.path, "wb") as stream:
+            stream.write(b'{"items": []}')
+
+        self.assertFalse(repo._append_item(lb.Book(title="a", author="A", pages=1)))
+
+        with open(self.path, "rb") as stream:
+            self.assertEqual(stream.read(), b'{"items": []}')
+
+    def test_change_in_another_repository_does_not_block_appends(self) -> None:
+        other = lb.LibraryRepository(os.path.join(self._tmp.name, "other.json"))
+        other.add_item(lb.Book(title="o", author="O", pages=1))
+        other.items[0].check_out(3)
+        repo = lb.LibraryRepository(self.path)
+        repo.save_items = self.fail  # type: ignore[assignment]
+
+        repo.add_item(lb.Book(title="a", author="A", pages=1))
+
+        self.assertEqual([row["title"] for row in self.read_rows()], ["a"])
+
+
+@unittest.skipIf(lb.msgpack is None, "msgpack is not installed")
+class MsgpackTests(RepositoryTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.msgpack_path = os.path.join(self._tmp.name, "items.msgpack")
+
+    def test_save_and_load_round_trip(self) -> None:
+        repo = lb.LibraryRepository(self.msgpack_path)
+        book = lb.Book(title="a", author="A", pages=1)
+        repo.add_item(book)
+        repo.add_item(lb.DVD(title="d", duration=90, rating=3))
+        book.check_out(3)
+        repo.save_items()
+
+        reloaded = lb.LibraryRepository(self.msgpack_path)
+
+        self.assertEqual(reloaded.items, repo.items)
+        with open(self.msgpack_path, "rb") as stream:
+            self.assertEqual(
+                lb.msgpack.unpackb(stream.read()), [item.to_dict() for item in repo.items]
+            )
+
+    def test_export_and_import_json(self) -> None:
+        repo = lb.LibraryRepository(self.msgpack_path)
+        repo.add_item(lb.Book(title="a", author="A", pages=1))
+        repo.add_item(lb.DVD(title="d", duration=90, rating=3))
+        export_path = os.path.join(self._tmp.name, "export.json")
+
+        repo.export_json(export_path)
+        other = lb.LibraryRepository(os.path.join(self._tmp.name, "other.msgpack"))
+        other.import_json(export_path)
+
+        self.assertEqual(other.items, repo.items)
+        self.assertEqual(lb.LibraryRepository(other.json_path).items, repo.items)
+
+    def test_errors_name_the_source_format(self) -> None:
+        repo = lb.LibraryRepository(self.msgpack_path)
+
+        with self.assertRaisesRegex(ValueError, "^Items MessagePack must"):
+            repo._build_items({"items": []})
+        with self.assertRaisesRegex(ValueError, "^Items JSON must"):
+            repo._build_items({"items": []}, "JSON")
+
+
+class LoadTests(RepositoryTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        repo = lb.LibraryRepository(self.path)
+        repo.add_item(lb.DVD(title="Film", duration=90, rating=4))
+
+    def test_new_repository_does_not_see_unsaved_changes(self) -> None:
+        first = lb.LibraryRepository(self.path)
+        first.items[0].check_out(3)
+
+        second = lb.LibraryRepository(self.path)
+
+        self.assertFalse(second.items[0].is_checked_out)
+        self.assertIsNot(second.items[0], first.items[0])
+
+    def test_load_items_discards_unsaved_changes(self) -> None:
+        repo = lb.LibraryRepository(self.path)
+        repo.items[0].check_out(3)
+
+        repo.load_items()
+
+        self.assertFalse(repo.items[0].is_checked_out)
+
+
+if __name__ == "__main__":
+    unittest.main()